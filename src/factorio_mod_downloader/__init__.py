@@ -1 +1,3 @@
 """Factorio Mod Downloader."""
+
+__version__ = "0.2.1"
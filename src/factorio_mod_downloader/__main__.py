@@ -1,13 +1,14 @@
 import os
 import re
+import stat
 import sys
-import webbrowser
 from pathlib import Path
-from tkinter import END, Label
+from tkinter import END
 
 import customtkinter
 from CTkMessagebox import CTkMessagebox
 
+from factorio_mod_downloader import __version__
 from factorio_mod_downloader.mod_downloader.mod_downloader import ModDownloader
 
 
@@ -15,9 +16,17 @@ customtkinter.set_appearance_mode("dark")
 customtkinter.set_default_color_theme("blue")
 
 
+GITHUB_URL = "https://github.com/vaibhavvikas/factorio-mod-downloader"
+
+MOD_URL_PATTERN = re.compile(r"^https://mods\.factorio\.com/mod/.*")
+
+# Resolved once at import; sys._MEIPASS never changes within a process.
+BUNDLE_DIR = getattr(sys, "_MEIPASS", "")
+
+
 def resource_path(relative_path):
-    if hasattr(sys, "_MEIPASS"):
-        return os.path.join(sys._MEIPASS, relative_path)
+    if BUNDLE_DIR:
+        return os.path.join(BUNDLE_DIR, relative_path)
     return relative_path
 
 
@@ -26,9 +35,13 @@ class App(customtkinter.CTk):
         super().__init__()
         self.resizable(0, 0)
         self.title("Factorio Mod Downloader")
-        self.geometry(f"{740}x{560}")
+        self.geometry("740x560")
         self.iconbitmap(resource_path("factorio_downloader.ico"))
 
+        # Shared fonts, created once instead of per widget.
+        self.tahoma_font = customtkinter.CTkFont(family="Tahoma")
+        self.title_font = customtkinter.CTkFont(family="Tahoma", size=20, weight="bold")
+
         self.frame_0 = customtkinter.CTkFrame(master=self)
         self.frame_0.pack(expand=True, pady=10, padx=10)
         self.frame_0.grid_rowconfigure(0, weight=1)
@@ -41,6 +54,9 @@ class App(customtkinter.CTk):
                 self.download_path.insert(0, output_path)
 
         def callback(url):
+            # Only needed if the user actually clicks the link.
+            import webbrowser
+
             webbrowser.open_new(url)
 
         # Title Frame
@@ -52,41 +68,26 @@ class App(customtkinter.CTk):
         self.title_label = customtkinter.CTkLabel(
             master=self.title_frame,
             text="Factorio Mod Downloader",
-            font=customtkinter.CTkFont(family="Tahoma", size=20, weight="bold"),
+            font=self.title_font,
         )
         self.title_label.grid(row=0, padx=10, sticky="nsw")
 
         self.title_sub_label = customtkinter.CTkLabel(
             master=self.title_frame,
             text="One Downloader for all your factorio mods.",
-            font=customtkinter.CTkFont(family="Tahoma"),
+            font=self.tahoma_font,
             text_color=("grey74", "grey60"),
         )
         self.title_sub_label.grid(row=1, padx=12, sticky="nsw")
-        github_repo = "https://github.com/vaibhavvikas/factorio-mod-downloader"
-        github_url = f"Made with ♥ by Vaibhav Vikas, {github_repo}"
         self.developer_label = customtkinter.CTkLabel(
             master=self.title_frame,
-            text=github_url,
-            font=customtkinter.CTkFont(family="Tahoma"),
+            text=f"Made with ♥ by Vaibhav Vikas, {GITHUB_URL}",
+            font=self.tahoma_font,
             text_color=("grey60", "grey74"),
             cursor="hand2",
         )
         self.developer_label.grid(row=2, padx=12, sticky="nsw")
-        self.developer_label.bind(
-            "<Button-1>",
-            lambda e: callback(
-                "https://github.com/vaibhavvikas/factorio-mod-downloader"
-            ),
-        )
-        self.developer_link = Label(self, text="Hyperlink", fg="blue", cursor="hand2")
-        self.developer_link.bind(
-            "<Button-1>",
-            lambda e: callback(
-                "https://github.com/vaibhavvikas/factorio-mod-downloader"
-            ),
-        )
-
+        self.developer_label.bind("<Button-1>", lambda e: callback(GITHUB_URL))
         # Body Frame
         self.body_frame = customtkinter.CTkFrame(master=self.frame_0)
         self.body_frame.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
@@ -134,7 +135,7 @@ class App(customtkinter.CTk):
         self.progress_file = customtkinter.CTkLabel(
             master=self.downloads_frame,
             text="Start download to see progress.",
-            font=customtkinter.CTkFont(family="Tahoma"),
+            font=self.tahoma_font,
             text_color=("grey74", "grey60"),
         )
         self.progress_file.grid(row=0, padx=12, sticky="nsw")
@@ -149,20 +150,31 @@ class App(customtkinter.CTk):
         self.progressbar.grid(
             row=1, column=0, padx=(10, 10), pady=(10, 10), sticky="ns"
         )
-        self.progressbar.start()
+        # The indeterminate animation is started on download start, not
+        # here, so an idle window does not repaint the bar forever.
+        self.progressbar.set(0)
 
         # Logs Frame
         self.textbox = customtkinter.CTkTextbox(
             master=self.frame_0,
             border_width=0,
             width=680,
-            font=customtkinter.CTkFont(family="Tahoma"),
+            font=self.tahoma_font,
         )
         self.textbox.grid(row=3, column=0, padx=10, pady=(0, 10), sticky="nsew")
-        self.textbox.insert("0.0", "Factorio Mod Downloader v0.2.1:\n")
+        self.textbox.insert("0.0", f"Factorio Mod Downloader v{__version__}:\n")
         self.textbox.yview(END)
         self.textbox.configure(state="disabled")
 
+    def show_error(self, message):
+        CTkMessagebox(
+            title="Error",
+            width=500,
+            wraplength=500,
+            message=message,
+            icon="cancel",
+        )
+
     def download_button_action(self):
         mod_url = self.mod_url.get()
         mod_url = mod_url.strip()
@@ -170,45 +182,44 @@ class App(customtkinter.CTk):
         download_path = self.download_path.get()
         download_path = download_path.strip()
 
-        if not mod_url or (
-            mod_url
-            and re.match(r"^https://mods\.factorio\.com/mod/.*", mod_url.strip())
-            is None
-        ):
-            CTkMessagebox(
-                title="Error",
-                width=500,
-                wraplength=500,
-                message="Please provide a valid mod_url!!!",
-                icon="cancel",
-            )
+        if not mod_url or MOD_URL_PATTERN.match(mod_url) is None:
+            self.show_error("Please provide a valid mod_url!!!")
             return
 
         if not download_path:
-            CTkMessagebox(
-                title="Error",
-                width=500,
-                message="Please provide a valid download_path!!!",
-                icon="cancel",
-            )
+            self.show_error("Please provide a valid download_path!!!")
             return
 
         self.download_button.configure(state="disabled", text="Download Started")
         download_path = f"{download_path}/mods"
         output = Path(download_path).expanduser().resolve()
 
-        if output.exists() and not output.is_dir():
-            CTkMessagebox(
-                title="Error",
-                width=500,
-                wraplength=500,
-                message=f"{output} already exists and is not a directory.\n"
-                "Enter a valid output directory.",
+        # One access() call answers writability; no need to create files
+        # or list the directory to find out.
+        if output.parent.exists() and not os.access(output.parent, os.W_OK):
+            self.show_error(
+                f"No write permission for {output.parent}.\n"
+                "Enter a writable output directory."
             )
             self.download_button.configure(state="normal", text="Start Download")
             return
 
-        if output.exists() and output.is_dir() and tuple(output.glob("*")):
+        # One stat() answers both the exists and is-directory questions
+        # that were previously four separate Path probes.
+        try:
+            output_mode = output.stat().st_mode
+        except FileNotFoundError:
+            output_mode = None
+
+        if output_mode is not None and not stat.S_ISDIR(output_mode):
+            self.show_error(
+                f"{output} already exists and is not a directory.\n"
+                "Enter a valid output directory."
+            )
+            self.download_button.configure(state="normal", text="Start Download")
+            return
+
+        if output_mode is not None and any(output.iterdir()):
             response = CTkMessagebox(
                 title="Continue?",
                 width=500,
@@ -226,19 +237,19 @@ class App(customtkinter.CTk):
 
         os.makedirs(download_path, exist_ok=True)
         try:
+            self.progressbar.start()
             mod_downloader = ModDownloader(mod_url, download_path, self)
             mod_downloader.start()
         except Exception as e:
-            CTkMessagebox(
-                title="Error",
-                width=500,
-                wraplength=500,
-                message=f"Unknown error occured.\n{str(e).split("\n")[0]}",
-            )
+            self.show_error(f"Unknown error occured.\n{str(e).split("\n")[0]}")
         return
 
 
 def main():
+    # Answer --version without building the Tk window at all.
+    if "--version" in sys.argv[1:]:
+        print(f"factorio-mod-downloader {__version__}")
+        return
     app = App()
     app.mainloop()
 
@@ -1,34 +1,81 @@
 import os
-import random
-import socket
+import re
 import time
-from threading import Thread
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from queue import Empty, Queue
+from threading import Lock, Thread
 from typing import Final
 
-import chromedriver_autoinstaller
-import requests
-from bs4 import BeautifulSoup
 from CTkMessagebox import CTkMessagebox
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 
 
-BASE_MOD_URL: Final = "https://re146.dev/factorio/mods/en#"
+MOD_PORTAL_URL: Final = "https://mods.factorio.com/mod"
+MODS_API_URL: Final = "https://mods.factorio.com/api/mods"
 BASE_DOWNLOAD_URL: Final = "https://mods-storage.re146.dev"
 
+# A dependency entry reads like "flib >= 0.12.0"; the name is whatever
+# comes before the first version-constraint operator.
+DEPENDENCY_VERSION_PATTERN: Final = re.compile(r"[<>=]")
+
+# Mods shipped with the game itself; never fetched from the portal.
+RESERVED_DEPENDENCIES: Final = frozenset(
+    {"base", "core", "space-age", "quality", "elevated-rails"}
+)
+
+# Resolved mod info is reused across runs for up to an hour, so a rerun
+# of the same modpack does not repeat every page fetch.
+MOD_INFO_CACHE_FILE: Final = os.path.join(
+    os.path.expanduser("~"), ".cache", "factorio-mod-downloader", "modinfo.json"
+)
+MOD_INFO_CACHE_TTL: Final = 3600
+
+# Receive-buffer bounds: big enough that syscall overhead is noise,
+# small enough that four parallel workers stay cache-friendly.
+MIN_BLOCK_SIZE: Final = 256 * 1024
+MAX_BLOCK_SIZE: Final = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class ModInfo:
+    name: str
+    version: str
+
+
+@lru_cache(maxsize=4096)
+def parse_version(version):
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split("."))
+
 
 class ModDownloader(Thread):
     def __init__(self, mod_url, output_path, app):
         super().__init__()
+        # Imported here so the GUI starts without paying for the network
+        # stack; it is only needed once a download begins.
+        import requests
+
         self.daemon = True
         self.output_path = output_path
         self.mod = mod_url
-        self.mod_url = BASE_MOD_URL + mod_url
+        self.mod_url = mod_url
         self.app = app
+        self.session = requests.Session()
+        # Size the connection pool for the four parallel download
+        # workers so they never block waiting for a pooled connection.
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # URLs and mod names already analyzed this run; shared
+        # dependencies are fetched once and cycles cannot recurse.
+        self.analyzed_mods = set()
+        # Latest unrendered progress update; see set_progress.
+        self._pending_progress = None
+        self._progress_lock = Lock()
 
     def run(self):
         try:
-            self.chrome_options = self._init_selenium()
             self.log_info(f"Loading mod {self.mod}.\n")
             self.download_mod_with_dependencies(self.mod_url, self.output_path)
             self.log_info("All mods downloaded successfully.\n")
@@ -63,167 +110,356 @@ class ModDownloader(Thread):
         finally:
             self.app.download_button.configure(state="normal", text="Start Download")
 
-    def is_port_free(self, port):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            result = sock.connect_ex(("localhost", port))
-            return result != 0
-
-    def _init_selenium(self):
-        # Set up chrome options
-        try:
+    def download_file(self, url, file_path, file_name, update_progress=True):
+        if update_progress:
             self.app.progress_file.after(
                 0,
                 lambda: self.app.progress_file.configure(
-                    text="Downloading and loading dependencies."
+                    text=f"Downloading {file_name}"
                 ),
             )
-            self.log_info("Downloading application dependencies.\n")
-            chromedriver_autoinstaller.install()
-            self.log_info("Finished downloading application dependencies.\n")
-            chrome_options = Options()
-
-            # Run in headless mode (without a GUI)
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--window-position=-2400,-2400")
-            chrome_options.add_argument("--disable-gpu")
-
-            port = 9222
-            while port:
-                if self.is_port_free(port):
-                    chrome_options.add_argument(f"--remote-debugging-port={port}")
-                    break
-                port += 10
-
-            self.log_info("Configured application dependencies.\n")
-            return chrome_options
-        except Exception as e:
-            self.log_info(str(e))
-            raise e
-
-    def init_driver(self):
-        driver = webdriver.Chrome(options=self.chrome_options)
-        return driver
-
-    def close_driver(self, driver):
-        driver.stop_client()
-        driver.close()
-        driver.quit()
-
-    def download_file(self, url, file_path, file_name):
-        self.app.progressbar.stop()
-        self.app.progressbar.configure(mode="determinate")
-        self.app.progress_file.after(
-            0, lambda: self.app.progress_file.configure(text=f"Downloading {file_name}")
-        )
-        self.app.progressbar.set(0)
-        response = requests.get(url, stream=True)
+        response = self.session.get(url, stream=True)
         response.raise_for_status()  # Check if the request was successful
 
         total_size = int(response.headers.get("content-length", 0))
 
-        block_size = max(1024 * 1024 * 10, total_size / 100)
+        if update_progress:
+            self.app.progressbar.stop()
+            if total_size:
+                self.app.progressbar.configure(mode="determinate")
+                self.app.progressbar.set(0)
+            else:
+                # Unknown content length: keep the bar indeterminate and
+                # skip all per-chunk percentage math below.
+                self.app.progressbar.configure(mode="indeterminate")
+                self.app.progressbar.start()
+
+        # Roughly 1% of the file, clamped: a tiny mod no longer gets a
+        # multi-megabyte buffer and a huge one stops at 4 MiB reads.
+        block_size = min(MAX_BLOCK_SIZE, max(MIN_BLOCK_SIZE, total_size // 100))
         progress = 0
 
-        with open(file_path, "wb") as file:
-            for chunk in response.iter_content(chunk_size=block_size):
-                file.write(chunk)
-                progress += len(chunk)
-                percentage = progress / total_size
-                self.app.progressbar.set(percentage)
-
-        self.app.progress_file.after(
-            0, lambda: self.app.progress_file.configure(text=f"Downloaded {file_name}")
-        )
+        # Emit progress every ~2% of the file rather than consulting the
+        # clock on every chunk; at most ~50 renders per download.
+        update_bytes = max(block_size, total_size // 50)
+        bytes_since_update = 0
+        inv_total = 1 / total_size if total_size else 0.0
+
+        stream = response.raw
+        stream.decode_content = True
+
+        # Overlap socket reads with disk writes: a reader thread fills
+        # buffers from the response while this thread drains them to the
+        # file, so a stall on either side no longer blocks the other.
+        # The buffers rotate through the free queue, so readinto still
+        # fills preallocated memory instead of allocating per chunk.
+        free_buffers = Queue()
+        for _ in range(4):
+            free_buffers.put(bytearray(block_size))
+        filled_buffers = Queue(maxsize=4)
+
+        def read_chunks():
+            try:
+                while True:
+                    buffer = free_buffers.get()
+                    read = stream.readinto(buffer)
+                    if not read:
+                        filled_buffers.put(None)
+                        break
+                    filled_buffers.put((buffer, read))
+            except Exception as error:
+                filled_buffers.put(error)
+
+        reader = Thread(target=read_chunks, daemon=True)
+        reader.start()
+
+        # Unbuffered: chunks are written straight through instead of
+        # being copied into Python's buffer layer first.
+        try:
+            with open(file_path, "wb", buffering=0) as file:
+                while True:
+                    item = filled_buffers.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    buffer, read = item
+                    file.write(memoryview(buffer)[:read])
+                    free_buffers.put(buffer)
+                    progress += read
+                    if update_progress and total_size:
+                        bytes_since_update += read
+                        if bytes_since_update >= update_bytes:
+                            bytes_since_update = 0
+                            self.app.progressbar.set(progress * inv_total)
+        except Exception:
+            # Unblock the reader before leaving: closing the response
+            # makes its pending readinto raise, and recycling whatever
+            # it already queued frees the slots it may be blocked on.
+            # Otherwise every failed download would strand the daemon
+            # thread and its pooled connection for the process lifetime.
+            response.close()
+            while True:
+                try:
+                    item = filled_buffers.get_nowait()
+                except Empty:
+                    break
+                if isinstance(item, tuple):
+                    free_buffers.put(item[0])
+            reader.join(timeout=5)
+            # A partial file would pass the next run's existing-file scan
+            # and never be retried; unlink directly, no exists check.
+            try:
+                os.unlink(file_path)
+            except OSError:
+                pass
+            raise
+
+        if update_progress:
+            if not total_size:
+                self.app.progressbar.stop()
+                self.app.progressbar.configure(mode="determinate")
+            self.set_progress(f"Downloaded {file_name}", 1)
         self.log_info(f"Downloaded: {file_path}.\n")
 
     def generate_anticache(self):
-        random_number = random.randint(
-            1_000_000_000_000_000, 9_999_999_999_999_999
-        )  # 16-digit number
-        return f"0.{random_number}"
+        # Just a cache-buster: seven raw bytes as hex are as unique as a
+        # 16-digit random integer without advancing Mersenne state.
+        return "0." + os.urandom(7).hex()
 
-    def get_required_dependencies(self, soup):
-        dependencies = []
-        required_deps = soup.find("dd", {"id": "mod-info-required-dependencies"})
+    def fetch_mod_info(self, mod_name):
+        # The portal page is rendered from this same API; fetching the
+        # JSON directly replaces a headless-browser render with one GET.
+        response = self.session.get(f"{MODS_API_URL}/{mod_name}/full", timeout=30)
+        response.raise_for_status()
+        return response.json()
 
-        if required_deps:
-            links = required_deps.find_all("a", href=True)
-            for link in links:
-                mod_name = link.text.strip()
-                mod_url = link["href"]
-                dependencies.append((mod_name, mod_url))
+    def get_latest_release(self, data):
+        releases = data.get("releases")
 
-        return dependencies
+        if not releases:
+            raise ValueError(f"No releases found for mod {data['name']}")
 
-    def get_latest_version(self, soup):
-        select = soup.find("select", {"id": "mod-version"})
+        # Pick the highest version by comparing preparsed integer tuples
+        # instead of trusting the order the API returns.
+        return max(releases, key=lambda release: parse_version(release["version"]))
 
-        if not select:
-            raise ValueError("No select element found with id 'mod-version'")
+    def get_required_dependencies(self, release):
+        dependencies = []
+        seen_names = set()
+        for entry in release.get("info_json", {}).get("dependencies", []):
+            entry = entry.strip()
+            # "!" marks an incompatibility and "?" / "(?)" an optional
+            # dependency; only unprefixed and "~" entries are required.
+            if entry.startswith(("!", "?", "(?)")):
+                continue
+            if entry.startswith("~"):
+                entry = entry[1:].lstrip()
+
+            dep_name = DEPENDENCY_VERSION_PATTERN.split(entry, maxsplit=1)[0].strip()
+            if not dep_name or dep_name in seen_names:
+                continue
+            seen_names.add(dep_name)
+            dependencies.append((dep_name, f"{MOD_PORTAL_URL}/{dep_name}"))
 
-        latest_version = None
+        return dependencies
 
-        for option in select.find_all("option"):
-            if "(last)" in option.text:
-                latest_version = option["value"]
-                break
+    def resolve_mod_tree(self, mod_url):
+        def show_analyzing():
+            self.app.progressbar.stop()
+            self.app.progressbar.configure(mode="indeterminate")
+            self.app.progressbar.start()
+
+        self.app.progress_file.after(0, show_analyzing)
+
+        cache = self._load_mod_info_cache()
+
+        download_list = []
+        pending = deque([mod_url])
+        while pending:
+            url = pending.popleft()
+            if url in self.analyzed_mods:
+                continue
+            self.analyzed_mods.add(url)
+
+            slug = url.rpartition("/")[2]
+            if slug in RESERVED_DEPENDENCIES:
+                self.log_info(f"Skipping built-in mod {slug}.\n")
+                continue
+
+            cached = cache.get(url)
+            if cached:
+                mod_name = cached["name"]
+                if mod_name in self.analyzed_mods:
+                    continue
+                self.analyzed_mods.add(mod_name)
+                latest_version = cached["version"]
+                dependencies = cached["dependencies"]
+                self.log_info(
+                    f"Loaded mod {mod_name} with version {latest_version} (cached).\n"
+                )
+            else:
+                self.app.progress_file.after(
+                    0,
+                    lambda slug=slug: self.app.progress_file.configure(
+                        text=f"Analayzing mod {slug}"
+                    ),
+                )
+
+                data = self.fetch_mod_info(slug)
+                mod_name = data["name"]
+                if mod_name in self.analyzed_mods:
+                    continue
+                self.analyzed_mods.add(mod_name)
+                release = self.get_latest_release(data)
+                latest_version = release["version"]
+                self.log_info(
+                    f"Loaded mod {mod_name} with version {latest_version}.\n"
+                )
+
+                self.log_info(f"Loading dependencies for {mod_name}.\n")
+                dependencies = self.get_required_dependencies(release)
+                cache[url] = {
+                    "name": mod_name,
+                    "version": latest_version,
+                    "dependencies": dependencies,
+                    "time": time.time(),
+                }
+
+            download_list.append(ModInfo(mod_name, latest_version))
+
+            if len(dependencies) == 0:
+                self.log_info(f"No dependency exists for {mod_name}.\n")
+                continue
+
+            for dep_name, dep_url in dependencies:
+                self.log_info(f"Analayzing dependency {dep_name} of {mod_name}\n")
+                pending.append(dep_url)
+
+        self._save_mod_info_cache(cache)
+        return download_list
+
+    def _load_mod_info_cache(self):
+        import json
+
+        # Pruning stays inside the try: a cache file that is valid JSON
+        # but the wrong shape degrades to a cold cache instead of
+        # failing every run until the user deletes it by hand.
+        try:
+            with open(MOD_INFO_CACHE_FILE, encoding="utf-8") as file:
+                cache = json.load(file)
 
-        # If no option with '(last)' is found, use the first version
-        if not latest_version:
-            first_option = select.find("option")
-            latest_version = first_option["value"]
+            cutoff = time.time() - MOD_INFO_CACHE_TTL
+            return {
+                url: entry for url, entry in cache.items() if entry["time"] >= cutoff
+            }
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            return {}
 
-        return latest_version
+    def _save_mod_info_cache(self, cache):
+        import json
 
-    def get_mod_name(self, soup):
-        dd_element = soup.find("dd", id="mod-info-name")
-        mod_name = dd_element.get_text(strip=True)
-        return mod_name.strip()
+        try:
+            os.makedirs(os.path.dirname(MOD_INFO_CACHE_FILE), exist_ok=True)
+            with open(MOD_INFO_CACHE_FILE, "w", encoding="utf-8") as file:
+                json.dump(cache, file)
+        except OSError:
+            pass
 
     def download_mod_with_dependencies(self, mod_url, download_path):
-        self.app.progressbar.stop()
-        self.app.progress_file.after(
-            0,
-            lambda: self.app.progress_file.configure(
-                text=f"Analayzing mod {mod_url.split("/")[-1]}"
-            ),
-        )
-        self.app.progressbar.configure(mode="indeterminate")
-        self.app.progressbar.start()
-
-        driver = self.init_driver()
-        driver.get(mod_url)
-        time.sleep(2)  # Wait 2 seconds for the page to load successfully.
-        html = driver.page_source
-        self.close_driver(driver)
-        soup = BeautifulSoup(html, "html.parser")
-
-        mod_name = self.get_mod_name(soup)
-        latest_version = self.get_latest_version(soup)
-        self.log_info(f"Loaded mod {mod_name} with version {latest_version}.\n")
-
-        download_url = f"{BASE_DOWNLOAD_URL}/{mod_name}/{latest_version}.zip?anticache={self.generate_anticache()}"
-        file_name = f"{mod_name}_{latest_version}.zip"
-        file_path = os.path.join(download_path, file_name)
-
-        # Download the mod file
+        # Resolve the whole dependency tree first, then download the
+        # collected files; the walk is an iterative queue instead of
+        # recursing once per dependency edge.
+        download_list = self.resolve_mod_tree(mod_url)
+
         os.makedirs(download_path, exist_ok=True)
-        self.log_info(f"Downloading {file_name}.\n")
-        self.download_file(download_url, file_path, file_name)
-
-        # Get required dependencies and recursively download them
-        self.log_info(f"Loading dependencies for {mod_name}.\n")
-        dependencies = self.get_required_dependencies(soup)
-        if len(dependencies) == 0:
-            self.log_info(f"No dependency exists for {mod_name}.\n")
+
+        # One directory scan replaces a stat call per candidate file.
+        existing_files = {entry.name for entry in os.scandir(download_path)}
+
+        pending_downloads = []
+        for mod_info in download_list:
+            file_name = f"{mod_info.name}_{mod_info.version}.zip"
+            if file_name in existing_files:
+                self.log_info(f"Skipping {file_name}, already downloaded.\n")
+                continue
+            # Everything but the anticache suffix is invariant per mod;
+            # build it once and append the fresh suffix at request time.
+            url_prefix = (
+                f"{BASE_DOWNLOAD_URL}/{mod_info.name}/{mod_info.version}.zip?anticache="
+            )
+            pending_downloads.append((url_prefix, file_name))
+
+        if not pending_downloads:
+            return
+
+        if len(pending_downloads) == 1:
+            url_prefix, file_name = pending_downloads[0]
+            self.log_info(f"Downloading {file_name}.\n")
+            self.download_file(
+                url_prefix + self.generate_anticache(),
+                os.path.join(download_path, file_name),
+                file_name,
+            )
             return
 
-        for dep_name, dep_url in dependencies:
-            self.log_info(f"Analayzing dependency {dep_name} of {mod_name}\n")
-            self.download_mod_with_dependencies(dep_url, download_path)
+        # Several files: download up to four at a time over the shared
+        # session and report progress as completed files.
+        def show_downloading():
+            self.app.progressbar.stop()
+            self.app.progressbar.configure(mode="determinate")
+            self.app.progressbar.set(0)
+
+        self.app.progress_file.after(0, show_downloading)
+
+        total = len(pending_downloads)
+        completed = 0
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = []
+            for url_prefix, file_name in pending_downloads:
+                file_path = os.path.join(download_path, file_name)
+                self.log_info(f"Downloading {file_name}.\n")
+                futures.append(
+                    executor.submit(
+                        self.download_file,
+                        url_prefix + self.generate_anticache(),
+                        file_path,
+                        file_name,
+                        False,
+                    )
+                )
+
+            for future in as_completed(futures):
+                future.result()
+                completed += 1
+                self.set_progress(
+                    f"Downloaded {completed}/{total} mods", completed / total
+                )
+
+    def set_progress(self, text, value):
+        # Last-writer-wins: overwrite the pending update and keep at
+        # most one callback scheduled, so fast download threads cannot
+        # queue a backlog of stale renders on the Tk event loop.
+        with self._progress_lock:
+            schedule = self._pending_progress is None
+            self._pending_progress = (text, value)
+        if schedule:
+            self.app.progress_file.after(0, self._apply_progress)
+
+    def _apply_progress(self):
+        with self._progress_lock:
+            text, value = self._pending_progress
+            self._pending_progress = None
+        self.app.progress_file.configure(text=text)
+        self.app.progressbar.set(value)
 
     def log_info(self, info):
-        self.app.textbox.configure(state="normal")
-        self.app.textbox.insert("end", info)
-        self.app.textbox.yview("end")
-        self.app.textbox.configure(state="disabled")
+        def append():
+            self.app.textbox.configure(state="normal")
+            self.app.textbox.insert("end", info)
+            self.app.textbox.yview("end")
+            self.app.textbox.configure(state="disabled")
+
+        # Emit the whole unlock/insert/scroll/lock block as one batch on
+        # the Tk main loop instead of four separate cross-thread calls.
+        self.app.textbox.after(0, append)